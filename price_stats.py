@@ -1,11 +1,107 @@
 # price_stats.py
+import functools
+import os
+import sys
 import threading
 import time
-from typing import Dict, Optional
-from fastapi import FastAPI, HTTPException, status
-from pydantic import BaseModel
+from typing import Annotated, Dict, Iterable, List, Optional, Tuple
+import numpy as np
+from fastapi import FastAPI, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from pydantic import BaseModel, ConfigDict, Field, StrictFloat, StrictInt
+
+try:
+    from numba import njit
+except ImportError:  # pragma: no cover - interpreters without numba wheels run the kernel as plain Python
+    def njit(*args, **kwargs):
+        return lambda func: func
 
 SLIDING_WINDOW = 60  # sliding time interval
+SLIDING_WINDOW_MS = SLIDING_WINDOW * 1000  # same interval in milliseconds, for the admission check
+# Buckets per window, rounded up to a power of two so the bucket index is ts_sec & SLIDING_WINDOW_MASK
+# instead of an integer division. The 4 spare buckets only ever hold seconds that are already outside
+# the window, which the read path filters out by timestamp.
+SLIDING_WINDOW_BUCKETS = 64
+SLIDING_WINDOW_MASK = SLIDING_WINDOW_BUCKETS - 1
+# Largest accepted tick timestamp (2**53 - 1 ms, far beyond any real clock). Bucket seconds live in int64
+# kernel arguments and float64 bucket records, so larger values would overflow instead of being stored.
+MAX_TIMESTAMP_MS = 2**53 - 1
+
+# (avg, max, min, count) of one window, computed from its buckets when statistics are read
+_Snapshot = Tuple[float, float, float, int]
+# (sum, count, min, max) of one window, the form in which windows of different shards are merged
+_Totals = Tuple[float, int, float, float]
+
+# False on free-threaded (3.13t+) builds running with the GIL disabled
+GIL_ENABLED = getattr(sys, "_is_gil_enabled", lambda: True)()
+
+# Known instrument universe, e.g. PRICE_STATS_INSTRUMENTS=AAPL,GOOG,MSFT. When set, every instrument's window
+# is allocated at startup and ticks for other instruments are rejected with 400. Unset, instruments are
+# added on their first tick.
+KNOWN_INSTRUMENTS: Optional[List[str]] = [
+    instrument.strip() for instrument in os.environ["PRICE_STATS_INSTRUMENTS"].split(",") if instrument.strip()
+] if os.environ.get("PRICE_STATS_INSTRUMENTS") else None
+
+# Independent StatisticsComputation shards the service spreads instruments over. With the GIL a single
+# shard is fastest; without it each shard's global lock serialises only its own share of instruments,
+# so we use one shard per core rounded up to a power of two.
+STATISTICS_SHARDS = 1 if GIL_ENABLED else 1 << ((os.cpu_count() or 1) - 1).bit_length()
+
+
+# field positions within one bucket record, a window is a (SLIDING_WINDOW_BUCKETS, _FIELDS) float64 array
+# so every field of a bucket sits in the same 40 contiguous bytes. ts and count are exact as float64 up to 2**53.
+_TS, _SUM, _COUNT, _MIN, _MAX = 0, 1, 2, 3, 4
+_FIELDS = 5
+
+
+@njit("void(float64[:, :], int64, int64, float64)", cache=True)
+def _update_bucket(buckets, idx, ts_sec, price):
+    """
+    Resets bucket idx of one window if it is stale and adds the tick to it. The signatures are given
+    explicitly so numba compiles the kernels once at import instead of on the first tick.
+    """
+    bucket = buckets[idx]
+
+    # If bucket is stale we drop its old data
+    if bucket[_TS] != ts_sec:
+        bucket[_TS] = ts_sec
+        bucket[_SUM] = 0.0
+        bucket[_COUNT] = 0.0
+        bucket[_MIN] = np.inf
+        bucket[_MAX] = -np.inf
+
+    # add new tick to respective bucket
+    bucket[_SUM] += price
+    bucket[_COUNT] += 1.0
+
+    # update min and max prices, plain comparisons rather than min()/max() calls
+    # (cheaper when the kernel runs as plain Python and well predicted once prices settle)
+    if price < bucket[_MIN]:
+        bucket[_MIN] = price
+    if price > bucket[_MAX]:
+        bucket[_MAX] = price
+
+
+@njit("void(float64[:, :], float64[:, :], int64, float64)", cache=True)
+def _apply_tick(global_buckets, buckets, ts_sec, price):
+    """
+    Compiled hot path of StatisticsComputation.add_tick: one pass that updates the same bucket index of the
+    global window and of the instrument's window.
+    """
+    idx = ts_sec & SLIDING_WINDOW_MASK
+    _update_bucket(global_buckets, idx, ts_sec, price)
+    _update_bucket(buckets, idx, ts_sec, price)
+
+
+@njit("void(float64[:, :], float64[:, :], int64[:], float64[:])", cache=True)
+def _apply_ticks(global_buckets, buckets, ts_secs, prices):
+    """
+    Batch form of _apply_tick: applies every (ts_sec, price) pair of one instrument in one compiled loop.
+    """
+    for i in range(ts_secs.shape[0]):
+        _apply_tick(global_buckets, buckets, ts_secs[i], prices[i])
 
 class Tick(BaseModel):
     """ Data models using Pydantic’s BaseModel to handle input validation.
@@ -14,10 +110,16 @@ class Tick(BaseModel):
     :param instrument (str): String identifier for the financial instrument (e.g., "AAPL".).
     :param price (float): Trade price for that instrument at this tick.
     :param timestamp  (int): timestamp in milliseconds .
+    Unknown fields are rejected and instances are immutable once validated. price and timestamp are strict,
+    so the validator skips its lax coercion path: price must be a JSON number and timestamp a JSON integer
+    no larger than MAX_TIMESTAMP_MS. NaN and ±Infinity prices are rejected, they would poison the window's
+    statistics and cannot be encoded as JSON numbers.
     """
+    model_config = ConfigDict(extra="forbid", frozen=True, allow_inf_nan=False)
+
     instrument: str
-    price: float
-    timestamp: int
+    price: StrictFloat
+    timestamp: StrictInt = Field(le=MAX_TIMESTAMP_MS)
 
 class Statistics(BaseModel):
     """
@@ -30,211 +132,434 @@ class Statistics(BaseModel):
     :param min (float): The minimum price seen in the last 60 seconds.
     :param count (int): The total number of ticks that fell into the last 60-second window.
     """
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
     avg: float
     max: float
     min: float
     count: int
 
-class _Bucket:
-    """
-    This class is a  container that holds aggregated tick statistics for exactly one second,
-    where __slots__ defines which attributes that are allowed for each _Bucket.
+# returned whenever a window holds no ticks, sharing one instance is safe because Statistics is frozen
+_EMPTY_STATS = Statistics(avg=0.0, max=0.0, min=0.0, count=0)
+# the same statistics pre-encoded, so idle GETs skip serialisation entirely
+_EMPTY_JSON = b'{"avg":0.0,"max":0.0,"min":0.0,"count":0}'
 
-    :param timestamp (int): records a tick into a bucket so we compute ts_sec = timestamp_ms // 1000.
-    If later a new tick maps to the same bucket index but a different ts_sec, we know this bucket is “stale”
-    and must be reset.
-    :param sum (float): Accumulates the total of all prices for ticks whose UNIX‐second equals timestamp.
-    :param count (int): How many ticks have been added to this bucket during its current second.
-    :param min_price (float): Tracks the minimum tick price seen within that second.
-    :param max_price (float): Tracks the maximum tick price seen within that second.
-    """
-    __slots__ = ("timestamp", "sum", "count", "min_price", "max_price")
-
-    def __init__(self):
-        self.timestamp: int = 0
-        self.sum: float = 0.0
-        self.count: int = 0
-        self.min_price: float = float("inf")
-        self.max_price: float = float("-inf")
-
-    def reset(self, new_timestamp: int):
-        self.timestamp = new_timestamp
-        self.sum = 0.0
-        self.count = 0
-        self.min_price = float("inf")
-        self.max_price = float("-inf")
+def _snapshot_from_totals(totals: Optional[_Totals]) -> Optional[_Snapshot]:
+    if totals is None:
+        return None
+    total, count, min_price, max_price = totals
+    return (total / count, max_price, min_price, count)
 
 class InstrumentStats:
     """
-    The InstrumentStats class maintains a per‐instrument, 60‐second sliding‐window of tick data
-    attributes using the same circular‐buffer approach as the global aggregator.
-    :param buckets (list): A list of exactly SLIDING_WINDOW (60 sec) _Bucket objects. Where each _Bucket
-    holds aggregated data (sum, count, min_price, max_price) for ticks that share the same UNIX‐second timestamp.
-    :param sum (float): the total of all tick prices for this instrument over the last 60 seconds.
-    :param count (int): how many ticks have been recorded for this instrument in that same window.
-    :param min_price (float): the smallest tick price seen for this instrument in the last 60 seconds.
-    :param max_price (float): the largest tick price seen for this instrument in the last 60 seconds.
+    The InstrumentStats class maintains a 60‐second sliding‐window of tick data using a circular buffer
+    of one‐second buckets. It backs every per‐instrument window as well as the global aggregator.
+    :param buckets (np.ndarray): a (SLIDING_WINDOW_BUCKETS, 5) float64 array indexed by ts_sec & SLIDING_WINDOW_MASK,
+    one contiguous (ts, sum, count, min, max) record per bucket, so a tick reads and writes a single 40-byte record.
+    ts is the UNIX‐second the bucket currently holds: if a new tick maps to the same bucket index but a different
+    ts_sec, we know this bucket is “stale” and must be reset.
+    There are no rolling totals: a tick only touches its own bucket, and avg, min, max and count are
+    reduced from the buckets that are still inside the window when statistics are read. This keeps min and
+    max correct after the bucket that held them is evicted.
+    :param _lock (Lock): guards this window's buckets, so readers never reduce a half-written bucket and
+    readers of one instrument never wait on writers of another.
     """
     def __init__(self):
-        self.buckets = [ _Bucket() for _ in range(SLIDING_WINDOW) ]
-        self.sum: float = 0.0
-        self.count: int = 0
-        self.min_price: float = float("inf")
-        self.max_price: float = float("-inf")
+        self.buckets = np.zeros((SLIDING_WINDOW_BUCKETS, _FIELDS), dtype=np.float64)
+        self.buckets[:, _MIN] = np.inf
+        self.buckets[:, _MAX] = -np.inf
+        self._lock = threading.Lock()
 
     def add_tick(self, price: float, ts_sec: int):
-        idx = ts_sec % SLIDING_WINDOW
-        bucket = self.buckets[idx]
-
-        # If bucket is stale we remove old data
-        if bucket.timestamp != ts_sec:
-            if bucket.count > 0:
-                self.sum   -= bucket.sum
-                self.count -= bucket.count
-            bucket.reset(ts_sec)
-
-        # add new tick to respective bucket
-        bucket.sum += price
-        bucket.count += 1
+        """
+        Adds a tick to this window alone. StatisticsComputation instead updates the global and the
+        instrument window together through _apply_tick.
+        """
+        with self._lock:
+            _update_bucket(self.buckets, ts_sec & SLIDING_WINDOW_MASK, ts_sec, price)
 
-        #update min and max prices
-        bucket.min_price = min(bucket.min_price, price)
-        bucket.max_price = max(bucket.max_price, price)
+    def totals(self, oldest_sec: int) -> Optional[_Totals]:
+        """
+        Reduces the buckets whose second is at or after oldest_sec into (sum, count, min, max).
+        Buckets holding older seconds are treated as evicted. Returns None when no tick is left in the window.
+        """
+        with self._lock:
+            # each reduction is a straight vectorised pass over the full contiguous arrays (np.dot against
+            # the mask, np.where with the neutral element) rather than first gathering the valid buckets
+            buckets = self.buckets
+            valid = buckets[:, _TS] >= oldest_sec
+            count = int(np.dot(buckets[:, _COUNT], valid))
+            if count == 0:
+                return None
+            total = float(np.dot(buckets[:, _SUM], valid))
+            min_price = float(np.where(valid, buckets[:, _MIN], np.inf).min())
+            max_price = float(np.where(valid, buckets[:, _MAX], -np.inf).max())
+        return (total, count, min_price, max_price)
 
-        # update rolling totals
-        self.sum += price
-        self.count += 1
-        self.min_price = min(self.min_price, price)
-        self.max_price = max(self.max_price, price)
+    def snapshot(self, oldest_sec: int) -> Optional[_Snapshot]:
+        """
+        Same window as totals, as (avg, max, min, count).
+        """
+        return _snapshot_from_totals(self.totals(oldest_sec))
 
-    def capture(self) -> Statistics:
+    def capture(self, oldest_sec: int) -> Statistics:
         """
         If no ticks have been recorded in the last 60 seconds,
         we return a Statistics where all fields are zero.
         """
-        if self.count == 0:
-            return Statistics(avg=0.0, max=0.0, min=0.0, count=0)
+        snapshot = self.snapshot(oldest_sec)
+        if snapshot is None:
+            return _EMPTY_STATS
 
         # else we return computed statistics
-        return Statistics(
-            avg=self.sum / self.count,
-            max=self.max_price,
-            min=self.min_price,
-            count=self.count,
-        )
+        avg, max_price, min_price, count = snapshot
+        return Statistics(avg=avg, max=max_price, min=min_price, count=count)
+
+class UnknownInstrumentError(KeyError):
+    """
+    Raised by add_tick/add_ticks when an instrument universe is configured and a tick names an instrument
+    outside it. It is raised before any tick is applied.
+    """
+
+class _InstrumentMap(dict):
+    """
+    The instruments map used when no instrument universe is configured: looking up an instrument that has not
+    ticked yet creates its InstrumentStats. setdefault is atomic, so two first ticks for the same instrument
+    always end up sharing one InstrumentStats. .get() never creates entries, so readers don't either.
+    """
+    def __missing__(self, instrument: str) -> InstrumentStats:
+        # only stored keys are interned, interning every incoming tick would cost an extra table probe
+        return self.setdefault(sys.intern(instrument), InstrumentStats())
 
 class StatisticsComputation:
     """
-    Maintains a 60-second sliding window of tick data for O(1) retrieval of avg, min, max, and count.
-    :param global_buckets (list): We create global_buckets to capture a list of buckets for each second within 60 seconds.
-    :param global_sum (float): We compute running sum of all prices in the last 60 seconds (across every instrument).
-    :param global_count (int): We compute total number of ticks in the last 60 seconds.
-    :param global_min (float): We track the minimum price seen in that same window.
-    :param global_max (float): We track the maximum price seen in that same window.
+    Maintains a 60-second sliding window of tick data with O(1) ingestion; avg, min, max, and count are reduced
+    from at most SLIDING_WINDOW_BUCKETS buckets on retrieval.
+    :param global_stats (InstrumentStats): the sliding window across every instrument, using the same bucket
+    layout as the per-instrument windows. A tick updates it and its instrument's window in one compiled pass,
+    holding the global lock and then the instrument lock (always in that order). Because every write holds the
+    global lock, writers to one StatisticsComputation are serialised; the instrument locks only keep readers of
+    one instrument from waiting on writers of another. Writer parallelism comes from the shards of
+    ShardedStatisticsComputation, each of which has its own global lock.
     :param instruments (dict): We define a dictionary that maps each instrument ID (a string type) to its own InstrumentStats
-    object, where each InstrumentStats internally maintains its own per-instrument aggregates (sum, count, min, max).
-    :param lock Lock: To ensure that we never corrupt the sliding 60-second computation when multiple threads
-    call add_tick or the GET methods concurrently.
+    object, where each InstrumentStats internally maintains its own per-instrument buckets. When a known instrument
+    universe is passed in, every InstrumentStats is allocated up front and ticks for any other instrument raise
+    UnknownInstrumentError; otherwise instruments are added on their first tick.
     """
-    def __init__(self):
-        self.global_buckets = [ _Bucket() for _ in range(SLIDING_WINDOW) ]
-        self.global_sum: float = 0.0
-        self.global_count: int = 0
-        self.global_min: float = float("inf")
-        self.global_max: float = float("-inf")
-        self.instruments: Dict[str, InstrumentStats] = {}
-        self.lock = threading.Lock()
+    def __init__(self, instruments: Optional[Iterable[str]] = None):
+        self.global_stats = InstrumentStats()
+        self.instruments: Dict[str, InstrumentStats]
+        self._fixed_universe = instruments is not None
+        if instruments is None:
+            self.instruments = _InstrumentMap()
+        else:
+            self.instruments = {sys.intern(instrument): InstrumentStats() for instrument in instruments}
 
     def add_tick(self, instrument: str, price: float, timestamp_ms: int) -> bool:
         """
         This method is responsible for adding a new tick price at a given timestamp
          into both the global sliding‐window and respecitve per‐instrument sliding‐window.
+        Raises UnknownInstrumentError if an instrument universe is configured and the instrument is not part
+        of it, whatever the tick's age.
         """
-        now_ms = int(time.time() * 1000)
-        if timestamp_ms < now_ms - SLIDING_WINDOW * 1000:
+        self._check_known(instrument)
+
+        now_ms = time.time_ns() // 1_000_000
+        if timestamp_ms < now_ms - SLIDING_WINDOW_MS:
             return False  # too old
 
         ts_sec = timestamp_ms // 1000
-        idx = ts_sec % SLIDING_WINDOW
-
-        with self.lock:
-            # update global bucket
-            bucket = self.global_buckets[idx]
-            if bucket.timestamp != ts_sec:
-                if bucket.count > 0:
-                    # evict old
-                    self.global_sum   -= bucket.sum
-                    self.global_count -= bucket.count
-                bucket.reset(ts_sec)
-
-            # add to global
-            bucket.sum += price
-            bucket.count += 1
-            bucket.min_price = min(bucket.min_price, price)
-            bucket.max_price = max(bucket.max_price, price)
-
-            # update global aggregates
-            self.global_sum += price
-            self.global_count += 1
-            self.global_min = min(self.global_min, price)
-            self.global_max = max(self.global_max, price)
-
-            # update per-instrument
-            inst = self.instruments.get(instrument)
-            if inst is None:
-                inst = InstrumentStats()
-                self.instruments[instrument] = inst
-            inst.add_tick(price, ts_sec)
+        # a single probe, without a universe this creates the window, so stale ticks never reach it
+        inst = self.instruments[instrument]
+
+        # update global and per-instrument buckets in one pass
+        with self.global_stats._lock, inst._lock:
+            _apply_tick(self.global_stats.buckets, inst.buckets, ts_sec, price)
 
         return True
 
+    def _check_known(self, instrument: str):
+        """
+        With a configured universe, raises UnknownInstrumentError for instruments outside it. It never creates
+        a window, so it can run before the stale-tick check.
+        """
+        if self._fixed_universe and instrument not in self.instruments:
+            raise UnknownInstrumentError(instrument)
+
+    def _batch(self, ticks: List[Tick]) -> List[Tuple[InstrumentStats, np.ndarray, np.ndarray]]:
+        """
+        First half of add_ticks, it mutates no bucket: checks every instrument in the batch, raising
+        UnknownInstrumentError for the first unknown one, and groups the ticks still inside the window
+        by instrument as (window, ts_secs, prices). Only instruments with an accepted tick get a window.
+        """
+        # group the batch by instrument so each instrument lock is taken once
+        grouped: Dict[str, List[Tick]] = {}
+        for tick in ticks:
+            grouped.setdefault(tick.instrument, []).append(tick)
+        for instrument in grouped:
+            self._check_known(instrument)
+
+        cutoff_ms = time.time_ns() // 1_000_000 - SLIDING_WINDOW_MS
+        batch = []
+        for instrument, instrument_ticks in grouped.items():
+            accepted = [tick for tick in instrument_ticks if tick.timestamp >= cutoff_ms]
+            if accepted:
+                ts_secs = np.array([tick.timestamp // 1000 for tick in accepted], dtype=np.int64)
+                prices = np.array([tick.price for tick in accepted], dtype=np.float64)
+                batch.append((self.instruments[instrument], ts_secs, prices))
+        return batch
+
+    def _apply_batch(self, batch: List[Tuple[InstrumentStats, np.ndarray, np.ndarray]]) -> int:
+        """
+        Second half of add_ticks: applies a prepared batch with the global lock taken once and each instrument
+        lock once. Returns how many ticks were applied.
+        """
+        applied = 0
+        with self.global_stats._lock:
+            for inst, ts_secs, prices in batch:
+                with inst._lock:
+                    _apply_ticks(self.global_stats.buckets, inst.buckets, ts_secs, prices)
+                applied += len(ts_secs)
+        return applied
+
+    def add_ticks(self, ticks: List[Tick]) -> int:
+        """
+        Batch form of add_tick. Ticks older than the window are skipped, the rest are applied with the global
+        lock taken once per batch and each instrument lock once per instrument present in the batch.
+        Returns how many ticks were accepted. Unknown instruments raise UnknownInstrumentError before any tick
+        is applied.
+        """
+        return self._apply_batch(self._batch(ticks))
+
+    @staticmethod
+    def _oldest_sec() -> int:
+        """
+        The oldest UNIX-second still inside the window. It is the second that contains the add_tick admission
+        cutoff, so a tick that was accepted stays visible until it falls out of the window.
+        """
+        return (time.time_ns() // 1_000_000 - SLIDING_WINDOW_MS) // 1000
+
     def get_statistics_all(self) -> Statistics:
         """
-        To retrieve statistics we use the context manager self.lock to make sure no concurrent thread is mutating
-        the global aggregates while we read them. If global_count == 0, there are no ticks in the last 60 seconds,
-        and we reset the statistics.
-        """
-        with self.lock:
-            if self.global_count == 0:
-                return Statistics(avg=0.0, max=0.0, min=0.0, count=0)
-            return Statistics(
-                avg=self.global_sum / self.global_count,
-                max=self.global_max,
-                min=self.global_min,
-                count=self.global_count,
-            )
+        To retrieve statistics we reduce the global window's buckets under its lock. If there are no ticks in
+        the last 60 seconds, we reset the statistics.
+        """
+        return self.global_stats.capture(self._oldest_sec())
 
     def get_statistics_instrument(self, instrument: str) -> Statistics:
         """
-        We retrieve statistics again, we use the context manager self.lock to ensure thread safety.
-        We look up inst = self.instruments.get(instrument). If there’s no entry for that instrument
+        We look up inst = self.instruments.get(instrument) and only take that instrument's lock, so readers
+        of one instrument never wait on writers of another. If there’s no entry for that instrument
         all of its buckets have been evicted in the last 60 seconds), we return zeros.
         """
-        with self.lock:
-            inst = self.instruments.get(instrument)
-            if inst is None or inst.count == 0:
-                return Statistics(avg=0.0, max=0.0, min=0.0, count=0)
-            return inst.capture()
+        inst = self.instruments.get(instrument)
+        if inst is None:
+            return _EMPTY_STATS
+        return inst.capture(self._oldest_sec())
+
+    def snapshot_all(self) -> Optional[_Snapshot]:
+        """
+        Returns the raw (avg, max, min, count) of the global window, or None when it holds no ticks,
+        for callers that serialise it themselves instead of building a Statistics model.
+        """
+        return self.global_stats.snapshot(self._oldest_sec())
+
+    def totals_all(self) -> Optional[_Totals]:
+        """
+        Returns the raw (sum, count, min, max) of the global window, or None when it holds no ticks.
+        """
+        return self.global_stats.totals(self._oldest_sec())
+
+    def snapshot_instrument(self, instrument: str) -> Optional[_Snapshot]:
+        """
+        Returns the raw (avg, max, min, count) of one instrument, or None when it holds no ticks.
+        """
+        inst = self.instruments.get(instrument)
+        if inst is None:
+            return None
+        return inst.snapshot(self._oldest_sec())
+
+
+class ShardedStatisticsComputation:
+    """
+    Spreads instruments over independent StatisticsComputation shards by hash(instrument) & (shards - 1), so
+    every shard has its own global lock and ticks for instruments on different shards never contend.
+    Instrument statistics come from the owning shard; global statistics merge the (sum, count, min, max)
+    totals of every shard, an O(shards) reduction. It exposes the same methods as StatisticsComputation.
+    :param shards (list): the StatisticsComputation shards, a power of two of them so routing is a bitmask.
+    A known instrument universe is split between the shards that own each instrument.
+    """
+    def __init__(self, shards: int, instruments: Optional[Iterable[str]] = None):
+        if shards < 1 or shards & (shards - 1):
+            raise ValueError(f"shards must be a power of two, got {shards}")
+        self._mask = shards - 1
+        if instruments is None:
+            self.shards = [StatisticsComputation() for _ in range(shards)]
+        else:
+            owned: List[List[str]] = [[] for _ in range(shards)]
+            for instrument in instruments:
+                owned[hash(instrument) & self._mask].append(instrument)
+            self.shards = [StatisticsComputation(shard_instruments) for shard_instruments in owned]
+
+    def _shard(self, instrument: str) -> StatisticsComputation:
+        return self.shards[hash(instrument) & self._mask]
+
+    def add_tick(self, instrument: str, price: float, timestamp_ms: int) -> bool:
+        return self._shard(instrument).add_tick(instrument, price, timestamp_ms)
+
+    def add_ticks(self, ticks: List[Tick]) -> int:
+        """
+        Every shard resolves its share of the batch before any shard applies it, so an unknown instrument
+        raises UnknownInstrumentError with nothing applied on any shard.
+        """
+        by_shard: Dict[int, List[Tick]] = {}
+        for tick in ticks:
+            by_shard.setdefault(hash(tick.instrument) & self._mask, []).append(tick)
+        batches = [(self.shards[i], self.shards[i]._batch(shard_ticks)) for i, shard_ticks in by_shard.items()]
+        return sum(shard._apply_batch(batch) for shard, batch in batches)
 
-app = FastAPI()
-service = StatisticsComputation()
+    def totals_all(self) -> Optional[_Totals]:
+        """
+        Merges the global totals of every shard, or None when no shard holds a tick.
+        """
+        merged: Optional[_Totals] = None
+        for shard in self.shards:
+            totals = shard.totals_all()
+            if totals is None:
+                continue
+            if merged is None:
+                merged = totals
+                continue
+            total, count, min_price, max_price = totals
+            merged = (
+                merged[0] + total,
+                merged[1] + count,
+                min_price if min_price < merged[2] else merged[2],
+                max_price if max_price > merged[3] else merged[3],
+            )
+        return merged
+
+    def snapshot_all(self) -> Optional[_Snapshot]:
+        return _snapshot_from_totals(self.totals_all())
+
+    def snapshot_instrument(self, instrument: str) -> Optional[_Snapshot]:
+        return self._shard(instrument).snapshot_instrument(instrument)
+
+    def get_statistics_all(self) -> Statistics:
+        snapshot = self.snapshot_all()
+        if snapshot is None:
+            return _EMPTY_STATS
+        avg, max_price, min_price, count = snapshot
+        return Statistics(avg=avg, max=max_price, min=min_price, count=count)
+
+    def get_statistics_instrument(self, instrument: str) -> Statistics:
+        return self._shard(instrument).get_statistics_instrument(instrument)
+
+
+def _statistics_response(snapshot: Optional[_Snapshot]) -> Response:
+    """
+    Builds the response of the statistics endpoints straight from a snapshot tuple, so GETs skip
+    constructing and re-serialising a Statistics model. The shape matches Statistics field for field.
+    An empty window is answered with the pre-encoded _EMPTY_JSON.
+    """
+    if snapshot is None:
+        return Response(content=_EMPTY_JSON, media_type="application/json")
+    avg, max_price, min_price, count = snapshot
+    return ORJSONResponse({"avg": avg, "max": max_price, "min": min_price, "count": count})
+
+# orjson encodes every response in C instead of the stdlib json module
+app = FastAPI(default_response_class=ORJSONResponse)
+service = (
+    StatisticsComputation(KNOWN_INSTRUMENTS) if STATISTICS_SHARDS == 1
+    else ShardedStatisticsComputation(STATISTICS_SHARDS, KNOWN_INSTRUMENTS)
+)
+
+
+def _finite_or_none(value):
+    """
+    Replaces NaN/±Infinity floats, anywhere inside value, with None so the result is valid JSON.
+    """
+    if isinstance(value, float):
+        return value if float("-inf") < value < float("inf") else None
+    if isinstance(value, dict):
+        return {key: _finite_or_none(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_finite_or_none(item) for item in value]
+    return value
+
+# 422 responses echo the rejected input, which may be NaN/Infinity. FastAPI's default handler encodes with
+# allow_nan=False and would fail with a 500, so those values are reported as null instead. The stdlib encoder
+# is kept here because, unlike orjson, it also handles out-of-range integers such as an oversized timestamp.
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    return JSONResponse(
+        status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+        content={"detail": _finite_or_none(jsonable_encoder(exc.errors()))},
+    )
+
+
+def _endpoint(handler):
+    """
+    With the GIL, handlers are wrapped as async def so they run directly on the event loop instead of being
+    dispatched to Starlette's threadpool. They only do in-memory work whose critical sections are a few
+    microseconds, so the threading.Lock held inside add_tick never blocks the loop for long.
+    Without the GIL the plain def is registered instead: the threadpool then runs requests truly in parallel,
+    and ticks for instruments on different shards are applied concurrently, each under its own shard's global lock.
+    """
+    if not GIL_ENABLED:
+        return handler
+
+    @functools.wraps(handler)
+    async def run_on_event_loop(*args, **kwargs):
+        return handler(*args, **kwargs)
+
+    return run_on_event_loop
 
 # POST /ticks
 # we return 201 for success we
 @app.post("/ticks", status_code=status.HTTP_201_CREATED)
+@_endpoint
 def post_tick(tick: Tick):
-    ok = service.add_tick(tick.instrument, tick.price, tick.timestamp)
+    try:
+        ok = service.add_tick(tick.instrument, tick.price, tick.timestamp)
+    except UnknownInstrumentError:
+        # not part of the configured instrument universe
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown instrument {tick.instrument!r}"
+        ) from None
     if not ok:
         # older than 60s, thus we return 204 No Content
         raise HTTPException(status_code=status.HTTP_204_NO_CONTENT)
     return {}
 
+# POST /ticks/batch
+# one request carries many ticks, so HTTP parsing and lock acquisition are paid once per batch.
+# We return 201 with the number of accepted ticks, or 204 if every tick was older than 60s;
+# an empty list is rejected with 422
+@app.post("/ticks/batch", status_code=status.HTTP_201_CREATED)
+@_endpoint
+def post_ticks(ticks: Annotated[List[Tick], Field(min_length=1)]):
+    try:
+        accepted = service.add_ticks(ticks)
+    except UnknownInstrumentError as e:
+        # not part of the configured instrument universe, nothing from the batch was applied
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail=f"Unknown instrument {e.args[0]!r}"
+        ) from None
+    if accepted == 0:
+        raise HTTPException(status_code=status.HTTP_204_NO_CONTENT)
+    return {"accepted": accepted}
+
 # GET /statistics
-@app.get("/statistics", response_model=Statistics)
+# Statistics is only declared for the OpenAPI schema, the handlers return a response built
+# from the snapshot so FastAPI skips both the model and jsonable_encoder
+@app.get("/statistics", responses={200: {"model": Statistics}})
+@_endpoint
 def get_stats():
-    return service.get_statistics_all()
+    return _statistics_response(service.snapshot_all())
 
 # GET /statistics/{instrument_identifier}
-@app.get("/statistics/{instrument}", response_model=Statistics)
+@app.get("/statistics/{instrument}", responses={200: {"model": Statistics}})
+@_endpoint
 def get_stats_instrument(instrument: str):
-    return service.get_statistics_instrument(instrument)
\ No newline at end of file
+    return _statistics_response(service.snapshot_instrument(instrument))
\ No newline at end of file
@@ -88,3 +88,193 @@ def test_concurrent_posts_and_gets():
     assert stats["min"] == 0.0
     assert stats["max"] == 99.0
     assert abs(stats["avg"] - (sum(range(100)) / 100)) < 1e-6
+
+
+def test_concurrent_posts_different_instruments():
+    import threading
+
+    ts = now_ms()
+    before = client.get("/statistics").json()["count"]
+
+    def post_many(instrument):
+        for i in range(50):
+            client.post("/ticks", json={"instrument": instrument, "price": float(i), "timestamp": ts})
+
+    instruments = ["S1", "S2", "S3", "S4"]
+    threads = [threading.Thread(target=post_many, args=(name,)) for name in instruments]
+    for t in threads: t.start()
+    for t in threads: t.join()
+
+    for name in instruments:
+        stats = client.get(f"/statistics/{name}").json()
+        assert stats["count"] == 50
+        assert stats["min"] == 0.0
+        assert stats["max"] == 49.0
+
+    assert client.get("/statistics").json()["count"] == before + 200
+
+
+def test_tick_with_unknown_field_rejected():
+    r = client.post("/ticks", json={"instrument": "A", "price": 1.0, "timestamp": now_ms(), "venue": "XNAS"})
+    assert r.status_code == 422
+
+
+def test_evicted_buckets_excluded_from_statistics():
+    from price_stats import InstrumentStats
+
+    inst = InstrumentStats()
+    inst.add_tick(100.0, 1_000)
+    inst.add_tick(1.0, 1_030)
+    inst.add_tick(3.0, 1_030)
+
+    assert inst.snapshot(oldest_sec=971) == (104.0 / 3, 100.0, 1.0, 3)
+    # the bucket holding the max price has left the window
+    assert inst.snapshot(oldest_sec=1_001) == (2.0, 3.0, 1.0, 2)
+    assert inst.snapshot(oldest_sec=1_031) is None
+
+
+def test_post_ticks_batch():
+    ts = now_ms()
+    ticks = [
+        {"instrument": "D", "price": 2.0, "timestamp": ts},
+        {"instrument": "D", "price": 4.0, "timestamp": ts},
+        {"instrument": "E", "price": 8.0, "timestamp": ts},
+        {"instrument": "D", "price": 100.0, "timestamp": ts - 61_000},  # too old, skipped
+    ]
+    r = client.post("/ticks/batch", json=ticks)
+    assert r.status_code == 201
+    assert r.json() == {"accepted": 3}
+
+    stats = client.get("/statistics/D").json()
+    assert stats == {"avg": 3.0, "max": 4.0, "min": 2.0, "count": 2}
+    assert client.get("/statistics/E").json()["count"] == 1
+
+    r = client.post("/ticks/batch", json=ticks[3:])
+    assert r.status_code == 204
+
+    # an empty batch is a client error, not "every tick was stale"
+    r = client.post("/ticks/batch", json=[])
+    assert r.status_code == 422
+
+
+def test_tick_fields_are_strict():
+    ts = now_ms()
+    # an integer price is still a JSON number
+    r = client.post("/ticks", json={"instrument": "F", "price": 7, "timestamp": ts})
+    assert r.status_code == 201
+
+    r = client.post("/ticks", json={"instrument": "F", "price": "7.5", "timestamp": ts})
+    assert r.status_code == 422
+    r = client.post("/ticks", json={"instrument": "F", "price": 7.5, "timestamp": str(ts)})
+    assert r.status_code == 422
+
+    # Starlette's json.loads parses these literals, the model must still reject them
+    for literal in ("NaN", "Infinity", "-Infinity"):
+        body = '{"instrument": "F", "price": %s, "timestamp": %d}' % (literal, ts)
+        r = client.post("/ticks", content=body, headers={"Content-Type": "application/json"})
+        assert r.status_code == 422
+    assert client.get("/statistics/F").json()["count"] == 1
+
+
+def test_sharded_statistics_merge_global_totals():
+    from price_stats import ShardedStatisticsComputation, StatisticsComputation
+
+    ts = now_ms()
+    sharded = ShardedStatisticsComputation(4)
+    single = StatisticsComputation()
+    for i, name in enumerate(["AAPL", "GOOG", "MSFT", "TSLA", "AMZN", "NVDA"]):
+        for price in (float(i), float(i + 10)):
+            assert sharded.add_tick(name, price, ts)
+            assert single.add_tick(name, price, ts)
+
+    assert sharded.get_statistics_all() == single.get_statistics_all()
+    assert sharded.get_statistics_all().count == 12
+    assert sharded.get_statistics_instrument("MSFT") == single.get_statistics_instrument("MSFT")
+    assert sharded.get_statistics_instrument("FOO").count == 0
+
+    with pytest.raises(ValueError):
+        ShardedStatisticsComputation(3)
+
+
+UNIVERSE = ["AAPL", "GOOG", "MSFT", "TSLA", "AMZN", "NVDA", "IBM", "ORCL"]
+
+
+@pytest.mark.parametrize("shards", [1, 4])
+def test_known_instrument_universe(monkeypatch, shards):
+    import price_stats
+    from price_stats import ShardedStatisticsComputation, StatisticsComputation
+
+    if shards == 1:
+        known = StatisticsComputation(UNIVERSE)
+        windows = [known]
+    else:
+        known = ShardedStatisticsComputation(shards, UNIVERSE)
+        windows = known.shards
+    assert set().union(*(shard.instruments for shard in windows)) == set(UNIVERSE)
+    monkeypatch.setattr(price_stats, "service", known)
+
+    ts = now_ms()
+    r = client.post("/ticks", json={"instrument": "AAPL", "price": 1.0, "timestamp": ts})
+    assert r.status_code == 201
+    r = client.post("/ticks", json={"instrument": "ZZZ", "price": 1.0, "timestamp": ts})
+    assert r.status_code == 400
+    # membership is checked before the tick's age
+    r = client.post("/ticks", json={"instrument": "ZZZ", "price": 1.0, "timestamp": ts - 61_000})
+    assert r.status_code == 400
+
+    # an unknown instrument rejects the whole batch, on every shard
+    batch = [{"instrument": name, "price": 2.0, "timestamp": ts} for name in UNIVERSE + ["ZZZ", "YYY", "XXX"]]
+    r = client.post("/ticks/batch", json=batch)
+    assert r.status_code == 400
+    assert client.get("/statistics").json()["count"] == 1
+    assert client.get("/statistics/GOOG").json()["count"] == 0
+    assert all("ZZZ" not in shard.instruments for shard in windows)
+
+    r = client.post("/ticks/batch", json=[{"instrument": "ZZZ", "price": 2.0, "timestamp": ts - 61_000}])
+    assert r.status_code == 400
+
+
+def test_far_future_timestamp_rejected(monkeypatch):
+    import price_stats
+
+    monkeypatch.setattr(price_stats, "service", price_stats.StatisticsComputation())
+    tick = {"instrument": "G", "price": 1.0, "timestamp": 10**22}
+    assert client.post("/ticks", json=tick).status_code == 422
+    assert client.post("/ticks/batch", json=[tick]).status_code == 422
+
+    # the largest accepted timestamp still fits the bucket arrays
+    tick["timestamp"] = 2**53 - 1
+    assert client.post("/ticks", json=tick).status_code == 201
+
+
+def test_endpoint_wrapping_follows_gil(monkeypatch):
+    import asyncio
+    import inspect
+    import price_stats
+
+    def handler(value: int):
+        return value * 2
+
+    # without the GIL the plain def is registered, so Starlette's threadpool runs it in parallel
+    monkeypatch.setattr(price_stats, "GIL_ENABLED", False)
+    assert price_stats._endpoint(handler) is handler
+
+    # with the GIL it becomes a coroutine function, which FastAPI runs on the event loop
+    monkeypatch.setattr(price_stats, "GIL_ENABLED", True)
+    wrapped = price_stats._endpoint(handler)
+    assert wrapped is not handler
+    assert inspect.iscoroutinefunction(wrapped)
+    assert asyncio.run(wrapped(21)) == 42
+
+
+def test_stale_tick_does_not_create_instrument(monkeypatch):
+    import price_stats
+
+    fresh = price_stats.StatisticsComputation()
+    monkeypatch.setattr(price_stats, "service", fresh)
+
+    old_ts = now_ms() - 61_000
+    assert client.post("/ticks", json={"instrument": "OLD1", "price": 1.0, "timestamp": old_ts}).status_code == 204
+    r = client.post("/ticks/batch", json=[{"instrument": "OLD2", "price": 1.0, "timestamp": old_ts}])
+    assert r.status_code == 204
+    assert len(fresh.instruments) == 0
@@ -4,63 +4,76 @@ tick_simulation.py
 This is an example script assumes your FastAPI service (price_stats.py) is running locally at http://127.0.0.1:8000.
 
 For testing purposes:
-1. Spawn multiple threads that occasionally POST random tick data to `/ticks`.
+1. Run multiple asyncio poster tasks that occasionally POST batches of random tick data to `/ticks/batch`.
 2. Periodically GET `/statistics` (global) and `/statistics/{instrument}` for a few instruments.
-3. Demonstrate idle times (no posts) and bursts (many threads posting in parallel).
+3. Demonstrate idle times (no posts) and bursts (many tasks posting concurrently).
 4. Print out the responses so you can see how the sliding‐window statistics update in real time.
+
+All tasks run on one thread and share a single `httpx.AsyncClient`, whose connection pool keeps the
+TCP connections alive between requests instead of handshaking for every POST.
 """
 
-import threading
+import asyncio
 import time
 import random
-import requests
+import httpx
 
 BASE_URL = "http://127.0.0.1:8000"
 
 INSTRUMENTS = ["AAPL", "GOOG", "MSFT", "TSLA", "AMZN"]
 
+# Ticks are buffered per poster task and sent to /ticks/batch when either limit is reached
+BATCH_SIZE = 100
+BATCH_INTERVAL = 0.2  # seconds
+
 
-def post_ticks_forever(thread_id: int):
+async def post_ticks_forever(client: httpx.AsyncClient, poster_id: int):
     """
-    Thread that continuously and randomly sends ticks for a random instrument.
+    Task that continuously and randomly generates ticks for a random instrument, buffers them and
+    sends them to `/ticks/batch` once BATCH_SIZE ticks are collected or BATCH_INTERVAL seconds have passed.
     """
+    batch = []
+    last_flush = time.monotonic()
     while True:
         # Pick a random instrument and a random price
         instr = random.choice(INSTRUMENTS)
         price = round(random.uniform(50.0, 500.0), 2)
-        timestamp_ms = int(time.time() * 1000)
+        timestamp_ms = time.time_ns() // 1_000_000
 
-        payload = {
+        batch.append({
             "instrument": instr,
             "price": price,
             "timestamp": timestamp_ms,
-        }
+        })
 
-        try:
-            r = requests.post(f"{BASE_URL}/ticks", json=payload, timeout=1.0)
-            if r.status_code == 201:
-                print(f"[Thread {thread_id}] Posted tick: {instr} @ {price:.2f}")
-            elif r.status_code == 204:
-                # tick was older than 60s; skip
-                print(f"[Thread {thread_id}] Old tick (ignored).")
-            else:
-                # could be a 422 or something else
-                print(f"[Thread {thread_id}] Unexpected status {r.status_code}")
-        except requests.RequestException as e:
-            print(f"[Thread {thread_id}] Error posting tick: {e}")
+        if len(batch) >= BATCH_SIZE or time.monotonic() - last_flush >= BATCH_INTERVAL:
+            try:
+                r = await client.post("/ticks/batch", json=batch)
+                if r.status_code == 201:
+                    print(f"[Poster {poster_id}] Posted {r.json()['accepted']} of {len(batch)} ticks")
+                elif r.status_code == 204:
+                    # every tick was older than 60s; skip
+                    print(f"[Poster {poster_id}] Old ticks (ignored).")
+                else:
+                    # could be a 422 or something else
+                    print(f"[Poster {poster_id}] Unexpected status {r.status_code}")
+            except httpx.HTTPError as e:
+                print(f"[Poster {poster_id}] Error posting ticks: {e}")
+            batch = []
+            last_flush = time.monotonic()
 
-        # Sleep for up to 200ms before sending the next tick
-        time.sleep(random.uniform(0.0, 0.2))
+        # Sleep for up to 200ms before generating the next tick
+        await asyncio.sleep(random.uniform(0.0, 0.2))
 
 
-def poll_statistics_forever():
+async def poll_statistics_forever(client: httpx.AsyncClient):
     """
     Periodically (every 2 seconds) fetch and print global stats and per-instrument stats.
     """
     while True:
         try:
             # 1) Global stats
-            r_global = requests.get(f"{BASE_URL}/statistics", timeout=1.0)
+            r_global = await client.get("/statistics")
             if r_global.status_code == 200:
                 data = r_global.json()
                 print(
@@ -69,13 +82,13 @@ def poll_statistics_forever():
                 )
             else:
                 print(f"→ [Global Stats] Unexpected status {r_global.status_code}")
-        except requests.RequestException as e:
+        except httpx.HTTPError as e:
             print(f"→ [Global Stats] Request error: {e}")
 
         # 2) Per-instrument stats (pick a couple at random each time)
         for instr in random.sample(INSTRUMENTS, k=2):
             try:
-                r_inst = requests.get(f"{BASE_URL}/statistics/{instr}", timeout=1.0)
+                r_inst = await client.get(f"/statistics/{instr}")
                 if r_inst.status_code == 200:
                     d = r_inst.json()
                     print(
@@ -84,35 +97,37 @@ def poll_statistics_forever():
                     )
                 else:
                     print(f"   [Stats {instr}] Unexpected status {r_inst.status_code}")
-            except requests.RequestException as e:
+            except httpx.HTTPError as e:
                 print(f"   [Stats {instr}] Request error: {e}")
 
         # Wait 2 seconds before polling again
-        time.sleep(2.0)
+        await asyncio.sleep(2.0)
 
 
-def main():
-    # 1) Start a few threads that post ticks
-    num_poster_threads = 5
-    for i in range(num_poster_threads):
-        t = threading.Thread(target=post_ticks_forever, args=(i + 1,), daemon=True)
-        t.start()
+async def run(num_posters: int):
+    # One pooled client shared by every task, timeout matches the previous per-request 1s
+    async with httpx.AsyncClient(base_url=BASE_URL, timeout=1.0) as client:
+        await asyncio.gather(
+            # 1) A few tasks that post ticks
+            *(post_ticks_forever(client, i + 1) for i in range(num_posters)),
+            # 2) One task that polls statistics
+            poll_statistics_forever(client),
+        )
 
-    # 2) Start one thread that polls statistics
-    poller = threading.Thread(target=poll_statistics_forever, daemon=True)
-    poller.start()
 
-    # 3) Let the script run indefinitely (Ctrl+C to stop)
+def main():
+    num_poster_tasks = 5
+
+    # Let the script run indefinitely (Ctrl+C to stop)
     print(
         "Example client started.\n"
-        f"- {num_poster_threads} posting threads sending random ticks.\n"
-        "- 1 polling thread fetching global + instrument stats every 2s.\n"
+        f"- {num_poster_tasks} poster tasks sending batches of random ticks.\n"
+        "- 1 polling task fetching global + instrument stats every 2s.\n"
         "Press Ctrl+C to quit.\n"
     )
 
     try:
-        while True:
-            time.sleep(0.5)
+        asyncio.run(run(num_poster_tasks))
     except KeyboardInterrupt:
         print("\nShutting down example client.")
 